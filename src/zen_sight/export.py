@@ -0,0 +1,1101 @@
+"""
+Headless static export of a Sight (PNG, SVG and self-contained HTML)
+"""
+
+import base64
+import html
+import json
+import re
+import struct
+import warnings
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+EXPORT_FORMATS = ("png", "svg", "html")
+
+# pixels per strip along a link's major axis when rasterizing
+SEGMENT_STRIP = 4
+
+# fragments shaded per batch when rasterizing, bounds peak memory
+FRAGMENT_BUDGET = 1 << 20
+
+# spring layout iterations for unpositioned nodes; each one is quadratic in
+# the node count, so graphs above LAYOUT_NODES get proportionally fewer
+LAYOUT_ITERATIONS = 50
+LAYOUT_MIN_ITERATIONS = 10
+LAYOUT_NODES = 500
+
+# largest margin around the graph as a fraction of the shorter image side
+MAX_MARGIN = 0.25
+
+# primitive kinds understood by the rasterizer
+DISK, SEGMENT, TRIANGLE = 0, 1, 2
+
+# CSS Color Module Level 4 named colors
+NAMED_COLORS = {
+    "aliceblue": "#f0f8ff",
+    "antiquewhite": "#faebd7",
+    "aqua": "#00ffff",
+    "aquamarine": "#7fffd4",
+    "azure": "#f0ffff",
+    "beige": "#f5f5dc",
+    "bisque": "#ffe4c4",
+    "black": "#000000",
+    "blanchedalmond": "#ffebcd",
+    "blue": "#0000ff",
+    "blueviolet": "#8a2be2",
+    "brown": "#a52a2a",
+    "burlywood": "#deb887",
+    "cadetblue": "#5f9ea0",
+    "chartreuse": "#7fff00",
+    "chocolate": "#d2691e",
+    "coral": "#ff7f50",
+    "cornflowerblue": "#6495ed",
+    "cornsilk": "#fff8dc",
+    "crimson": "#dc143c",
+    "cyan": "#00ffff",
+    "darkblue": "#00008b",
+    "darkcyan": "#008b8b",
+    "darkgoldenrod": "#b8860b",
+    "darkgray": "#a9a9a9",
+    "darkgreen": "#006400",
+    "darkgrey": "#a9a9a9",
+    "darkkhaki": "#bdb76b",
+    "darkmagenta": "#8b008b",
+    "darkolivegreen": "#556b2f",
+    "darkorange": "#ff8c00",
+    "darkorchid": "#9932cc",
+    "darkred": "#8b0000",
+    "darksalmon": "#e9967a",
+    "darkseagreen": "#8fbc8f",
+    "darkslateblue": "#483d8b",
+    "darkslategray": "#2f4f4f",
+    "darkslategrey": "#2f4f4f",
+    "darkturquoise": "#00ced1",
+    "darkviolet": "#9400d3",
+    "deeppink": "#ff1493",
+    "deepskyblue": "#00bfff",
+    "dimgray": "#696969",
+    "dimgrey": "#696969",
+    "dodgerblue": "#1e90ff",
+    "firebrick": "#b22222",
+    "floralwhite": "#fffaf0",
+    "forestgreen": "#228b22",
+    "fuchsia": "#ff00ff",
+    "gainsboro": "#dcdcdc",
+    "ghostwhite": "#f8f8ff",
+    "gold": "#ffd700",
+    "goldenrod": "#daa520",
+    "gray": "#808080",
+    "green": "#008000",
+    "greenyellow": "#adff2f",
+    "grey": "#808080",
+    "honeydew": "#f0fff0",
+    "hotpink": "#ff69b4",
+    "indianred": "#cd5c5c",
+    "indigo": "#4b0082",
+    "ivory": "#fffff0",
+    "khaki": "#f0e68c",
+    "lavender": "#e6e6fa",
+    "lavenderblush": "#fff0f5",
+    "lawngreen": "#7cfc00",
+    "lemonchiffon": "#fffacd",
+    "lightblue": "#add8e6",
+    "lightcoral": "#f08080",
+    "lightcyan": "#e0ffff",
+    "lightgoldenrodyellow": "#fafad2",
+    "lightgray": "#d3d3d3",
+    "lightgreen": "#90ee90",
+    "lightgrey": "#d3d3d3",
+    "lightpink": "#ffb6c1",
+    "lightsalmon": "#ffa07a",
+    "lightseagreen": "#20b2aa",
+    "lightskyblue": "#87cefa",
+    "lightslategray": "#778899",
+    "lightslategrey": "#778899",
+    "lightsteelblue": "#b0c4de",
+    "lightyellow": "#ffffe0",
+    "lime": "#00ff00",
+    "limegreen": "#32cd32",
+    "linen": "#faf0e6",
+    "magenta": "#ff00ff",
+    "maroon": "#800000",
+    "mediumaquamarine": "#66cdaa",
+    "mediumblue": "#0000cd",
+    "mediumorchid": "#ba55d3",
+    "mediumpurple": "#9370db",
+    "mediumseagreen": "#3cb371",
+    "mediumslateblue": "#7b68ee",
+    "mediumspringgreen": "#00fa9a",
+    "mediumturquoise": "#48d1cc",
+    "mediumvioletred": "#c71585",
+    "midnightblue": "#191970",
+    "mintcream": "#f5fffa",
+    "mistyrose": "#ffe4e1",
+    "moccasin": "#ffe4b5",
+    "navajowhite": "#ffdead",
+    "navy": "#000080",
+    "oldlace": "#fdf5e6",
+    "olive": "#808000",
+    "olivedrab": "#6b8e23",
+    "orange": "#ffa500",
+    "orangered": "#ff4500",
+    "orchid": "#da70d6",
+    "palegoldenrod": "#eee8aa",
+    "palegreen": "#98fb98",
+    "paleturquoise": "#afeeee",
+    "palevioletred": "#db7093",
+    "papayawhip": "#ffefd5",
+    "peachpuff": "#ffdab9",
+    "peru": "#cd853f",
+    "pink": "#ffc0cb",
+    "plum": "#dda0dd",
+    "powderblue": "#b0e0e6",
+    "purple": "#800080",
+    "rebeccapurple": "#663399",
+    "red": "#ff0000",
+    "rosybrown": "#bc8f8f",
+    "royalblue": "#4169e1",
+    "saddlebrown": "#8b4513",
+    "salmon": "#fa8072",
+    "sandybrown": "#f4a460",
+    "seagreen": "#2e8b57",
+    "seashell": "#fff5ee",
+    "sienna": "#a0522d",
+    "silver": "#c0c0c0",
+    "skyblue": "#87ceeb",
+    "slateblue": "#6a5acd",
+    "slategray": "#708090",
+    "slategrey": "#708090",
+    "snow": "#fffafa",
+    "springgreen": "#00ff7f",
+    "steelblue": "#4682b4",
+    "tan": "#d2b48c",
+    "teal": "#008080",
+    "thistle": "#d8bfd8",
+    "tomato": "#ff6347",
+    "turquoise": "#40e0d0",
+    "violet": "#ee82ee",
+    "wheat": "#f5deb3",
+    "white": "#ffffff",
+    "whitesmoke": "#f5f5f5",
+    "yellow": "#ffff00",
+    "yellowgreen": "#9acd32",
+    "transparent": "#00000000",
+}
+
+_FUNCTION_PATTERN = re.compile(r"(rgba?|hsla?)\(([^)]*)\)")
+
+# hue units accepted by hsl(), in degrees per unit
+_HUE_UNITS = {"deg": 1.0, "grad": 0.9, "rad": 180 / np.pi, "turn": 360.0, "": 1.0}
+
+
+def _number(text: str, scale: float) -> float:
+    """Parse a CSS number, where percentages are relative to scale"""
+    if text.endswith("%"):
+        return float(text[:-1]) / 100.0
+    return float(text) / scale
+
+
+def _hsl_to_rgb(hue: float, saturation: float, lightness: float) -> list:
+    a = saturation * min(lightness, 1 - lightness)
+    k = (np.array([0.0, 8.0, 4.0]) + hue / 30.0) % 12
+    return list(lightness - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+
+
+def parse_color(value: str) -> np.ndarray:
+    """
+    Parse a CSS color into an RGBA float array in [0, 1]
+
+    Supports named colors, hex notation, rgb()/rgba() with numbers or
+    percentages, and hsl()/hsla(). Raises ValueError for anything else.
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"Unsupported color: {value!r}")
+    text = value.strip().lower()
+    text = NAMED_COLORS.get(text, text)
+
+    try:
+        if text.startswith("#"):
+            digits = text[1:]
+            if len(digits) in (3, 4):
+                digits = "".join(c * 2 for c in digits)
+            if len(digits) == 6:
+                digits += "ff"
+            if len(digits) == 8:
+                channels = [int(digits[i : i + 2], 16) for i in range(0, 8, 2)]
+                return np.array(channels, dtype=float) / 255.0
+
+        match = _FUNCTION_PATTERN.fullmatch(text)
+        if match:
+            parts = [p for p in re.split(r"[\s,/]+", match.group(2)) if p]
+            if len(parts) in (3, 4):
+                alpha = _number(parts[3], 1.0) if len(parts) == 4 else 1.0
+                if match.group(1).startswith("rgb"):
+                    rgb = [_number(p, 255.0) for p in parts[:3]]
+                else:
+                    hue = re.fullmatch(r"([-+.\deE]+)([a-z]*)", parts[0])
+                    rgb = _hsl_to_rgb(
+                        float(hue.group(1)) * _HUE_UNITS[hue.group(2)] % 360,
+                        np.clip(_number(parts[1], 100.0), 0, 1),
+                        np.clip(_number(parts[2], 100.0), 0, 1),
+                    )
+                return np.clip(np.array(rgb + [alpha], dtype=float), 0.0, 1.0)
+    except (AttributeError, KeyError, ValueError):
+        pass
+
+    raise ValueError(f"Unsupported color: {value!r}")
+
+
+def _color(value: Optional[str], default: str) -> np.ndarray:
+    """Parse a configured color, warning and using the default if it is invalid"""
+    if value is None:
+        return parse_color(default)
+    try:
+        return parse_color(value)
+    except ValueError as error:
+        warnings.warn(f"{error}, using {default!r} instead", stacklevel=5)
+        return parse_color(default)
+
+
+def _layout(sight) -> np.ndarray:
+    """Node positions as an (N, 3) array, filling in missing ones with networkx"""
+    nodes = sight.nodes
+    # None and NaN coordinates count as unset, a missing z just means flat
+    positions = np.array(
+        [
+            [node.get(axis) if node.get(axis) is not None else np.nan for axis in "xyz"]
+            for node in nodes
+        ],
+        dtype=float,
+    ).reshape(-1, 3)
+    positions[:, 2] = np.nan_to_num(positions[:, 2], nan=0, posinf=0, neginf=0)
+    missing = set(np.flatnonzero(~np.isfinite(positions[:, :2]).all(axis=1)).tolist())
+    positions[~np.isfinite(positions)] = 0
+
+    if missing:
+        import networkx as nx
+
+        dim = 3 if sight.graph_type == "3D" else 2
+        G = nx.Graph()
+        G.add_nodes_from(range(len(nodes)))
+        index = {node["id"]: i for i, node in enumerate(nodes)}
+        G.add_edges_from(
+            (index[link["source"]], index[link["target"]])
+            for link in sight.links
+            if link["source"] in index and link["target"] in index
+        )
+
+        fixed = [i for i in range(len(nodes)) if i not in missing]
+        center, scale = np.zeros(dim), 100.0
+        if fixed:
+            low = positions[fixed, :dim].min(axis=0)
+            high = positions[fixed, :dim].max(axis=0)
+            center = (low + high) / 2
+            scale = float((high - low).max()) / 2 or scale
+
+        try:
+            # spring_layout assumes a unit-sized domain, so run it on the fixed
+            # positions normalized to [-1, 1] and map the result back
+            iterations = int(LAYOUT_ITERATIONS * min(1, LAYOUT_NODES / len(nodes)))
+            layout = nx.spring_layout(
+                G,
+                dim=dim,
+                seed=0,
+                iterations=max(iterations, LAYOUT_MIN_ITERATIONS),
+                pos={i: (positions[i, :dim] - center) / scale for i in fixed} or None,
+                fixed=fixed or None,
+            )
+        except ImportError:
+            # large graphs need scipy for spring_layout, which is optional, so
+            # put the missing nodes on a circle spanning the fixed ones instead
+            layout = nx.circular_layout(G.subgraph(sorted(missing)), dim=dim)
+        for i in missing:
+            positions[i, :dim] = center + np.asarray(layout[i]) * scale
+
+    return positions
+
+
+def _project(
+    positions: np.ndarray, width: int, height: int, padding: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orthographic projection onto the viewport, returns (xy, depth)
+
+    padding is the margin kept between node centers and the image edge
+    """
+    if len(positions) == 0:
+        return np.zeros((0, 2)), np.zeros(0)
+
+    xy = positions[:, :2]
+    low, high = xy.min(axis=0), xy.max(axis=0)
+    extent = np.maximum(high - low, 1e-9)
+    scale = min(
+        max(width - 2 * padding, 1) / extent[0],
+        max(height - 2 * padding, 1) / extent[1],
+    )
+    center = (low + high) / 2
+    screen = (xy - center) * scale + np.array([width / 2, height / 2])
+    return screen, positions[:, 2]
+
+
+_DEFAULTS_2D = {
+    "backgroundColor": "#ffffff",
+    "nodeOpacity": 1,
+    "linkColor": "rgba(0, 0, 0, 0.15)",
+    "linkOpacity": 1,
+}
+
+_DEFAULTS_3D = {
+    "backgroundColor": "#000011",
+    "nodeOpacity": 0.75,
+    "linkColor": "#f0f0f0",
+    "linkOpacity": 0.2,
+}
+
+
+def _scene(sight, width: int, height: int, padding: float) -> Dict[str, Any]:
+    """Resolve positions and styles into flat arrays shared by every format"""
+    config = sight.config
+    nodes = sight.nodes
+    is_3d = sight.graph_type == "3D"
+    # unset styles fall back to the defaults of the react-force-graph
+    # component the frontend would render with
+    defaults = _DEFAULTS_3D if is_3d else _DEFAULTS_2D
+
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+
+    # nodes: radius follows react-force-graph, sqrt(val) * nodeRelSize
+    rel_size = config.get("nodeRelSize", 4)
+    radii = np.array(
+        [
+            np.sqrt(node.get("size", config.get("nodeSize", 5))) * rel_size
+            for node in nodes
+        ],
+        dtype=float,
+    )
+
+    # keep the largest node inside the padding rather than clipped at the edge,
+    # but never let the margin eat more than half the viewport on thumbnails
+    margin = padding + (radii.max() if len(radii) else 0)
+    margin = min(margin, MAX_MARGIN * min(width, height))
+    xy, depth = _project(_layout(sight), width, height, margin)
+
+    # App.js always passes nodeColor as a function, so force-graph never
+    # applies nodeAutoColorBy and nodes fall back to gray like they do here
+    node_colors = np.array(
+        [
+            _color(node.get("color") or config.get("nodeColor"), "#696969")
+            for node in nodes
+        ]
+    ).reshape(-1, 4)
+    node_colors[:, 3] *= config.get("nodeOpacity", defaults["nodeOpacity"])
+
+    # links
+    link_pairs = [
+        (index[link["source"]], index[link["target"]], link)
+        for link in sight.links
+        if link["source"] in index and link["target"] in index
+    ]
+    links = np.array([pair[:2] for pair in link_pairs], dtype=np.int64).reshape(-1, 2)
+    link_colors = np.array(
+        [
+            _color(pair[2].get("color", config.get("linkColor")), defaults["linkColor"])
+            for pair in link_pairs
+        ]
+    ).reshape(-1, 4)
+    link_colors[:, 3] *= config.get("linkOpacity", defaults["linkOpacity"])
+    link_widths = np.array(
+        [pair[2].get("width", config.get("linkWidth", 1)) for pair in link_pairs],
+        dtype=float,
+    )
+
+    # faces: 3D ignores the fill alpha in favor of faceOpacity, like the frontend
+    faces = np.array(
+        [
+            [index[node_id] for node_id in face["nodes"]]
+            for face in sight.faces
+            if len(face["nodes"]) == 3 and all(n in index for n in face["nodes"])
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    if is_3d:
+        face_fill = _color(config.get("faceFillColor"), "#6496fa")
+        face_fill[3] = config.get("faceOpacity", 0.3)
+        face_stroke = np.zeros(4)
+        face_stroke_width = 0.0
+    else:
+        face_fill = _color(config.get("faceFillColor"), "rgba(100, 150, 250, 0.2)")
+        face_stroke = _color(config.get("faceStrokeColor"), "rgba(100, 150, 250, 0.5)")
+        face_stroke_width = float(config.get("faceStrokeWidth", 1))
+
+    # painter's order: in 3D draw the furthest primitives (smallest z) first
+    node_order = np.argsort(depth, kind="stable") if is_3d else np.arange(len(nodes))
+    link_order = (
+        np.argsort(depth[links].mean(axis=1), kind="stable")
+        if is_3d
+        else np.arange(len(links))
+    )
+    face_order = (
+        np.argsort(depth[faces].mean(axis=1), kind="stable")
+        if is_3d
+        else np.arange(len(faces))
+    )
+
+    label_key = config.get("nodeLabel", "name")
+    labels = [
+        str(node.get(label_key, node["id"])) if isinstance(label_key, str) else ""
+        for node in nodes
+    ]
+
+    return {
+        "width": width,
+        "height": height,
+        "background": _color(
+            config.get("backgroundColor"), defaults["backgroundColor"]
+        ),
+        "xy": xy,
+        "radii": radii,
+        "node_colors": node_colors,
+        "node_order": node_order,
+        "labels": labels,
+        "links": links[link_order],
+        "link_colors": link_colors[link_order],
+        "link_widths": link_widths[link_order],
+        "faces": faces[face_order],
+        "face_fill": face_fill,
+        "face_stroke": face_stroke,
+        "face_stroke_width": face_stroke_width,
+        # the 2D frontend paints faces in onRenderFramePost, over everything else
+        "faces_on_top": not is_3d,
+    }
+
+
+# PNG
+
+
+def _windows(low: np.ndarray, high: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Pixel windows [x0, y0, x1, y1) covering float boxes, clipped to the canvas"""
+    height, width = shape
+    windows = np.empty((len(low), 4), dtype=np.int64)
+    windows[:, 0] = np.clip(np.floor(low[:, 0]), 0, width)
+    windows[:, 1] = np.clip(np.floor(low[:, 1]), 0, height)
+    windows[:, 2] = np.clip(np.ceil(high[:, 0]) + 1, 0, width)
+    windows[:, 3] = np.clip(np.ceil(high[:, 1]) + 1, 0, height)
+    return windows
+
+
+def _segment_windows(params: np.ndarray, shape: Tuple[int, int]):
+    """
+    Split segments into disjoint strips along their major axis
+
+    Long diagonal links would otherwise sample their whole bounding box.
+    Returns (owner, windows) with one row per strip.
+    """
+    a, d, half = params[:, 0:2], params[:, 2:4] - params[:, 0:2], params[:, 4]
+    rows = np.arange(len(params))
+    major = (np.abs(d[:, 1]) > np.abs(d[:, 0])).astype(np.int64)
+    minor = 1 - major
+    a_major, d_major = a[rows, major], d[rows, major]
+    a_minor, d_minor = a[rows, minor], d[rows, minor]
+    size = np.array(shape[::-1])
+    size_major, size_minor = size[major], size[minor]
+
+    # a pixel within half + 0.5 of the segment is at most that far from its
+    # line, i.e. (half + 0.5) / cos(angle) along the minor axis; past the
+    # ends the strips clamp to the endpoint, which is closer still
+    flat = d_major == 0
+    slope = np.abs(d_minor) / np.where(flat, 1, np.abs(d_major))
+    reach = (half + 0.5) * np.hypot(1, slope)
+
+    lo = np.minimum(a_major, a_major + d_major) - half - 1
+    hi = np.maximum(a_major, a_major + d_major) + half + 1
+    start = np.clip(np.floor(lo), 0, size_major).astype(np.int64)
+    stop = np.clip(np.ceil(hi) + 1, 0, size_major).astype(np.int64)
+    strips = -(-(stop - start) // SEGMENT_STRIP)
+
+    owner = np.repeat(rows, strips)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(strips) - strips, strips)
+    s0 = start[owner] + step * SEGMENT_STRIP
+    s1 = np.minimum(s0 + SEGMENT_STRIP, stop[owner])
+
+    # minor-axis extent of the line over the strip
+    scale = np.where(flat, 1, d_major)[owner]
+    t0 = np.clip((s0 - a_major[owner]) / scale, 0, 1)
+    t1 = np.clip((s1 - a_major[owner]) / scale, 0, 1)
+    t0[flat[owner]], t1[flat[owner]] = 0, 1
+    m0 = a_minor[owner] + t0 * d_minor[owner]
+    m1 = a_minor[owner] + t1 * d_minor[owner]
+    # pixel v is sampled at v + 0.5
+    m_lo = np.floor(np.minimum(m0, m1) - reach[owner] - 0.5)
+    m_hi = np.ceil(np.maximum(m0, m1) + reach[owner] - 0.5)
+    m_lo = np.clip(m_lo, 0, size_minor[owner]).astype(np.int64)
+    m_hi = np.clip(m_hi, 0, size_minor[owner]).astype(np.int64)
+
+    horizontal = major[owner] == 0
+    windows = np.column_stack(
+        [
+            np.where(horizontal, s0, m_lo),
+            np.where(horizontal, m_lo, s0),
+            np.where(horizontal, s1, m_hi),
+            np.where(horizontal, m_hi, s1),
+        ]
+    )
+    return owner, windows
+
+
+def _disk_coverage(p, window, x, y):
+    cx, cy, edge = p[:, 0], p[:, 1], p[:, 2] + 0.5
+    dx, dy = x - cx[window], y - cy[window]
+    dist = np.sqrt(dx * dx + dy * dy)
+    return np.clip(edge[window] - dist, 0, 1)
+
+
+def _segment_coverage(p, window, x, y):
+    d = p[:, 2:4] - p[:, 0:2]
+    length = np.hypot(d[:, 0], d[:, 1])
+    u = d / np.where(length == 0, 1, length)[:, None]
+    rx, ry = x - p[window, 0], y - p[window, 1]
+    ux, uy = u[window, 0], u[window, 1]
+    t = np.clip(rx * ux + ry * uy, 0, length[window])
+    dx, dy = rx - t * ux, ry - t * uy
+    dist = np.sqrt(dx * dx + dy * dy)
+    # hairlines thinner than a pixel fade instead of shrinking
+    edge, fade = p[:, 4] + 0.5, p[:, 5]
+    return np.clip(edge[window] - dist, 0, 1) * fade[window]
+
+
+def _triangle_coverage(p, window, x, y):
+    # distance to the nearest edge, positive inside
+    inside = np.minimum.reduce(
+        [p[window, j] * x + p[window, 3 + j] * y + p[window, 6 + j] for j in range(3)]
+    )
+    return np.clip(inside + 0.5, 0, 1)
+
+
+_COVERAGE = {
+    DISK: _disk_coverage,
+    SEGMENT: _segment_coverage,
+    TRIANGLE: _triangle_coverage,
+}
+
+
+def _fragments(windows: np.ndarray):
+    """Pixel coordinates of every fragment and the window it belongs to"""
+    width = windows[:, 2] - windows[:, 0]
+    height = windows[:, 3] - windows[:, 1]
+
+    # expand windows into rows, then rows into pixels
+    rows = np.repeat(np.arange(len(windows)), height)
+    row_y = np.arange(len(rows)) - np.repeat(
+        np.cumsum(height) - height - windows[:, 1], height
+    )
+    row_width = width[rows]
+    x = np.arange(row_width.sum()) - np.repeat(
+        np.cumsum(row_width) - row_width - windows[rows, 0], row_width
+    )
+    return np.repeat(rows, row_width), x, np.repeat(row_y, row_width)
+
+
+def _composite(
+    canvas: np.ndarray, pixel: np.ndarray, alpha: np.ndarray, color: np.ndarray
+):
+    """
+    Alpha-composite fragments in draw order onto a flat (H * W, 3) canvas
+
+    The result matches blending the fragments one after another: each one
+    is weighted by the transmittance of everything drawn over it later.
+    """
+    # fully opaque fragments are capped just below 1 to keep the logs finite
+    log_t = np.log1p(-np.minimum(alpha, 1 - 1e-9))
+
+    if (color == color[0]).all():
+        # a single color blends the same in any order
+        transmittance = np.exp(np.bincount(pixel, log_t, minlength=len(canvas)))
+        canvas *= transmittance[:, None]
+        canvas += (1 - transmittance)[:, None] * color[0]
+        return
+
+    order = np.argsort(pixel, kind="stable")
+    pixel, alpha, color, log_t = pixel[order], alpha[order], color[order], log_t[order]
+    starts = np.r_[True, pixel[1:] != pixel[:-1]]
+    ends = np.r_[starts[1:], True]
+    group = np.cumsum(starts) - 1
+
+    total = np.cumsum(log_t)
+    weight = alpha * np.exp(total[ends][group] - total)
+    transmittance = np.exp(total[ends] - total[starts] + log_t[starts])
+
+    targets = pixel[ends]
+    blended = canvas[targets] * transmittance[:, None]
+    for channel in range(3):
+        blended[:, channel] += np.bincount(
+            group, weight * color[:, channel], minlength=len(targets)
+        )
+    canvas[targets] = blended
+
+
+def _primitives(scene: Dict[str, Any]):
+    """Flatten a scene into (kind, params, color, box) rows in draw order"""
+    xy = scene["xy"]
+    parts = []
+
+    def add(kind, rows, color, box, key):
+        params = np.zeros((len(rows), 9))
+        params[:, : rows.shape[1]] = rows
+        parts.append(
+            (
+                np.full(len(rows), kind),
+                params,
+                np.broadcast_to(color, (len(rows), 4)),
+                np.broadcast_to(box, (len(rows), 4)),
+                key,
+            )
+        )
+
+    # faces: the fill and then the outline of each face, in face order, either
+    # below the links and nodes or above them
+    faces, links, order = scene["faces"], scene["links"], scene["node_order"]
+    if scene["faces_on_top"]:
+        offset, face_offset = 0.0, float(len(links) + len(order))
+    else:
+        offset, face_offset = 4.0 * len(faces), 0.0
+    corners = xy[faces].reshape(-1, 3, 2)
+    face_keys = face_offset + 4.0 * np.arange(len(faces))
+    edges = np.roll(corners, -1, axis=1) - corners
+    area = edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0]
+    valid = area != 0
+    # inward unit edge normals, so the signed distance is positive inside
+    lengths = np.hypot(edges[valid, :, 0], edges[valid, :, 1])
+    sign = np.sign(area[valid])[:, None]
+    nx = -edges[valid, :, 1] * sign / lengths
+    ny = edges[valid, :, 0] * sign / lengths
+    c = -(nx * corners[valid, :, 0] + ny * corners[valid, :, 1])
+    box = np.hstack([corners[valid].min(axis=1) - 1, corners[valid].max(axis=1) + 1])
+    add(TRIANGLE, np.hstack([nx, ny, c]), scene["face_fill"], box, face_keys[valid])
+
+    stroke = scene["face_stroke_width"]
+    if stroke > 0:
+        for j in range(3):
+            rows = np.column_stack(
+                [
+                    corners[:, j],
+                    corners[:, (j + 1) % 3],
+                    np.full(len(faces), max(stroke, 1.0) / 2),
+                    np.full(len(faces), min(stroke, 1.0)),
+                ]
+            )
+            add(SEGMENT, rows, scene["face_stroke"], 0, face_keys + 1 + j)
+
+    widths = scene["link_widths"]
+    rows = np.column_stack(
+        [
+            xy[links[:, 0]],
+            xy[links[:, 1]],
+            np.maximum(widths, 1.0) / 2,
+            np.minimum(widths, 1.0),
+        ]
+    )
+    add(SEGMENT, rows, scene["link_colors"], 0, offset + np.arange(len(links)))
+
+    offset += len(links)
+    centers, radii = xy[order], scene["radii"][order]
+    box = np.hstack([centers - radii[:, None] - 1, centers + radii[:, None] + 1])
+    rows = np.column_stack([centers, radii])
+    add(DISK, rows, scene["node_colors"][order], box, offset + np.arange(len(order)))
+
+    kind, params, color, box, key = (np.concatenate(p) for p in zip(*parts))
+    order = np.argsort(key, kind="stable")
+    return kind[order], params[order], color[order], box[order]
+
+
+def _draw(canvas, width, kind, params, color, owner, windows):
+    """Shade and composite the fragments of a batch of windows"""
+    window, x, y = _fragments(windows)
+    kinds = kind[owner]
+
+    # sample at pixel centers
+    px, py = (x + 0.5).astype(np.float32), (y + 0.5).astype(np.float32)
+    unique = np.unique(kinds)
+    if len(unique) == 1:
+        coverage = _COVERAGE[unique[0]](params[owner], window, px, py)
+    else:
+        # mixed batches only happen where faces, links and nodes meet
+        coverage = np.empty(len(x), dtype=np.float32)
+        for k in unique:
+            selected = np.flatnonzero(kinds == k)
+            mask = kinds[window] == k
+            local = np.searchsorted(selected, window[mask])
+            coverage[mask] = _COVERAGE[k](
+                params[owner[selected]], local, px[mask], py[mask]
+            )
+
+    alpha = coverage * color[owner, 3][window]
+    hit = alpha > 0
+    if hit.any():
+        _composite(
+            canvas,
+            y[hit] * width + x[hit],
+            alpha[hit],
+            color[owner, :3][window[hit]],
+        )
+
+
+def rasterize(scene: Dict[str, Any]) -> np.ndarray:
+    """
+    Rasterize a scene into an (H, W, 3) uint8 array
+
+    Primitives are expanded into per-pixel fragments over their windows, then
+    shaded and composited with NumPy in batches of about FRAGMENT_BUDGET.
+    """
+    height, width = scene["height"], scene["width"]
+    background = scene["background"]
+    canvas = np.empty((height * width, 3))
+    canvas[:] = background[:3] * background[3] + (1 - background[3])
+
+    kind, params, color, box = _primitives(scene)
+    shape = (height, width)
+
+    # one window per disk or triangle and one per strip of each segment,
+    # kept in draw order
+    segments = np.flatnonzero(kind == SEGMENT)
+    others = np.flatnonzero(kind != SEGMENT)
+    strip_owner, strip_windows = _segment_windows(params[segments], shape)
+    owner = np.concatenate([segments[strip_owner], others])
+    windows = np.concatenate(
+        [strip_windows, _windows(box[others, :2], box[others, 2:], shape)]
+    )
+    order = np.argsort(owner, kind="stable")
+    owner, windows = owner[order], windows[order]
+
+    counts = (windows[:, 2] - windows[:, 0]).clip(0) * (
+        windows[:, 3] - windows[:, 1]
+    ).clip(0)
+    owner, windows, counts = owner[counts > 0], windows[counts > 0], counts[counts > 0]
+
+    # float32 is plenty for coverage and halves the per-fragment memory traffic
+    shading = params.astype(np.float32)
+    bounds = np.cumsum(counts)
+    start = 0
+    while start < len(owner):
+        limit = (bounds[start - 1] if start else 0) + FRAGMENT_BUDGET
+        stop = max(int(np.searchsorted(bounds, limit, side="right")), start + 1)
+        _draw(
+            canvas, width, kind, shading, color, owner[start:stop], windows[start:stop]
+        )
+        start = stop
+
+    return np.round(np.clip(canvas, 0, 1) * 255).astype(np.uint8).reshape(shape + (3,))
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an (H, W, 3) uint8 array as an RGB PNG"""
+    height, width = image.shape[:2]
+    # filter type 0 (None) in front of every scanline
+    raw = np.concatenate(
+        [np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)],
+        axis=1,
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+# SVG
+
+
+def _svg_paint(attribute: str, color: np.ndarray) -> str:
+    """SVG has no rgba(), so alpha goes in a separate opacity attribute"""
+    r, g, b = np.round(color[:3] * 255).astype(int)
+    return f'{attribute}="rgb({r},{g},{b})" {attribute}-opacity="{color[3]:.3g}"'
+
+
+def render_svg(scene: Dict[str, Any]) -> str:
+    """Render a scene as an SVG document"""
+    xy = scene["xy"]
+    width, height = scene["width"], scene["height"]
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}">',
+        f'<rect width="100%" height="100%" {_svg_paint("fill", scene["background"])}/>',
+    ]
+
+    face_parts = []
+    if len(scene["faces"]):
+        stroke = (
+            f" {_svg_paint('stroke', scene['face_stroke'])}"
+            f' stroke-width="{scene["face_stroke_width"]:g}" stroke-linejoin="round"'
+            if scene["face_stroke_width"] > 0
+            else ""
+        )
+        face_parts.append(
+            f'<g class="faces" {_svg_paint("fill", scene["face_fill"])}{stroke}>'
+        )
+        for face in scene["faces"]:
+            points = " ".join(f"{x:.2f},{y:.2f}" for x, y in xy[face])
+            face_parts.append(f'<polygon points="{points}"/>')
+        face_parts.append("</g>")
+    if not scene["faces_on_top"]:
+        parts.extend(face_parts)
+
+    parts.append('<g class="links" stroke-linecap="round">')
+    for (s, t), color, width in zip(
+        scene["links"], scene["link_colors"], scene["link_widths"]
+    ):
+        parts.append(
+            f'<line x1="{xy[s, 0]:.2f}" y1="{xy[s, 1]:.2f}" '
+            f'x2="{xy[t, 0]:.2f}" y2="{xy[t, 1]:.2f}" '
+            f"{_svg_paint('stroke', color)} "
+            f'stroke-width="{max(width, 1.0):g}"/>'
+        )
+    parts.append("</g>")
+
+    parts.append('<g class="nodes">')
+    for i in scene["node_order"]:
+        label = html.escape(scene["labels"][i])
+        parts.append(
+            f'<circle cx="{xy[i, 0]:.2f}" cy="{xy[i, 1]:.2f}" '
+            f'r="{scene["radii"][i]:.2f}" '
+            f"{_svg_paint('fill', scene['node_colors'][i])}>"
+            f"<title>{label}</title></circle>"
+        )
+    parts.append("</g>")
+
+    if scene["faces_on_top"]:
+        parts.extend(face_parts)
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+# HTML
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Zen Sight</title>
+<style>
+  html, body {{ margin: 0; height: 100%; overflow: hidden; background: {background}; }}
+  canvas {{ display: block; cursor: grab; }}
+</style>
+</head>
+<body>
+<canvas id="sight" width="{width}" height="{height}"></canvas>
+<script id="sight-data" type="application/json">{payload}</script>
+<script>
+(() => {{
+  const payload = JSON.parse(document.getElementById("sight-data").textContent);
+  const decode = (b64, Type) => {{
+    const bytes = Uint8Array.from(atob(b64), (c) => c.charCodeAt(0));
+    return new Type(bytes.buffer);
+  }};
+  const xy = decode(payload.xy, Float32Array);
+  const radii = decode(payload.radii, Float32Array);
+  const nodeColors = decode(payload.nodeColors, Uint8Array);
+  const nodeOrder = decode(payload.nodeOrder, Uint32Array);
+  const links = decode(payload.links, Uint32Array);
+  const linkColors = decode(payload.linkColors, Uint8Array);
+  const linkWidths = decode(payload.linkWidths, Float32Array);
+  const faces = decode(payload.faces, Uint32Array);
+  const rgba = (c, i) =>
+    `rgba(${{c[4 * i]}},${{c[4 * i + 1]}},${{c[4 * i + 2]}},${{c[4 * i + 3] / 255}})`;
+
+  const canvas = document.getElementById("sight");
+  const ctx = canvas.getContext("2d");
+  let view = {{ x: 0, y: 0, k: 1 }};
+
+  const drawFaces = () => {{
+    ctx.fillStyle = payload.faceFill;
+    ctx.strokeStyle = payload.faceStroke;
+    ctx.lineWidth = payload.faceStrokeWidth;
+    for (let f = 0; f < faces.length; f += 3) {{
+      ctx.beginPath();
+      ctx.moveTo(xy[2 * faces[f]], xy[2 * faces[f] + 1]);
+      ctx.lineTo(xy[2 * faces[f + 1]], xy[2 * faces[f + 1] + 1]);
+      ctx.lineTo(xy[2 * faces[f + 2]], xy[2 * faces[f + 2] + 1]);
+      ctx.closePath();
+      ctx.fill();
+      if (payload.faceStrokeWidth > 0) ctx.stroke();
+    }}
+  }};
+
+  const draw = () => {{
+    canvas.width = window.innerWidth;
+    canvas.height = window.innerHeight;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.translate(
+      (canvas.width - payload.width) / 2 + view.x,
+      (canvas.height - payload.height) / 2 + view.y,
+    );
+    ctx.scale(view.k, view.k);
+
+    if (!payload.facesOnTop) drawFaces();
+
+    ctx.lineCap = "round";
+    for (let l = 0; l < links.length / 2; l++) {{
+      ctx.strokeStyle = rgba(linkColors, l);
+      ctx.lineWidth = Math.max(linkWidths[l], 1);
+      ctx.beginPath();
+      ctx.moveTo(xy[2 * links[2 * l]], xy[2 * links[2 * l] + 1]);
+      ctx.lineTo(xy[2 * links[2 * l + 1]], xy[2 * links[2 * l + 1] + 1]);
+      ctx.stroke();
+    }}
+
+    for (const n of nodeOrder) {{
+      ctx.fillStyle = rgba(nodeColors, n);
+      ctx.beginPath();
+      ctx.arc(xy[2 * n], xy[2 * n + 1], radii[n], 0, 2 * Math.PI);
+      ctx.fill();
+    }}
+
+    if (payload.facesOnTop) drawFaces();
+  }};
+
+  const toScene = (event) => [
+    (event.clientX - (canvas.width - payload.width) / 2 - view.x) / view.k,
+    (event.clientY - (canvas.height - payload.height) / 2 - view.y) / view.k,
+  ];
+
+  let drag = null;
+  canvas.addEventListener("mousedown", (e) => {{
+    drag = {{ x: e.clientX - view.x, y: e.clientY - view.y }};
+  }});
+  window.addEventListener("mouseup", () => (drag = null));
+  canvas.addEventListener("mousemove", (e) => {{
+    if (drag) {{
+      view.x = e.clientX - drag.x;
+      view.y = e.clientY - drag.y;
+      draw();
+      return;
+    }}
+    const [x, y] = toScene(e);
+    let hit = -1;
+    for (const n of nodeOrder) {{
+      if (Math.hypot(xy[2 * n] - x, xy[2 * n + 1] - y) <= radii[n]) hit = n;
+    }}
+    canvas.title = hit >= 0 ? payload.labels[hit] : "";
+  }});
+  canvas.addEventListener("wheel", (e) => {{
+    e.preventDefault();
+    const [x, y] = toScene(e);
+    const k = view.k * Math.exp(-e.deltaY * 0.001);
+    view.x += x * (view.k - k);
+    view.y += y * (view.k - k);
+    view.k = k;
+    draw();
+  }}, {{ passive: false }});
+  window.addEventListener("resize", draw);
+  draw();
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def _b64(array: np.ndarray, dtype: str) -> str:
+    return base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode(
+        "ascii"
+    )
+
+
+def _css_color(color: np.ndarray) -> str:
+    r, g, b = np.round(color[:3] * 255).astype(int)
+    return f"rgba({r}, {g}, {b}, {color[3]:.3g})"
+
+
+def render_html(scene: Dict[str, Any]) -> str:
+    """Render a scene as a self-contained HTML page with binary-packed data"""
+
+    def rgba8(colors: np.ndarray) -> np.ndarray:
+        return np.round(np.clip(colors, 0, 1) * 255)
+
+    payload = {
+        "width": scene["width"],
+        "height": scene["height"],
+        # little-endian typed arrays, decoded with Float32Array/Uint32Array in JS
+        "xy": _b64(scene["xy"], "<f4"),
+        "radii": _b64(scene["radii"], "<f4"),
+        "nodeColors": _b64(rgba8(scene["node_colors"]), "u1"),
+        "nodeOrder": _b64(scene["node_order"], "<u4"),
+        "links": _b64(scene["links"], "<u4"),
+        "linkColors": _b64(rgba8(scene["link_colors"]), "u1"),
+        "linkWidths": _b64(scene["link_widths"], "<f4"),
+        "faces": _b64(scene["faces"], "<u4"),
+        "faceFill": _css_color(scene["face_fill"]),
+        "faceStroke": _css_color(scene["face_stroke"]),
+        "faceStrokeWidth": scene["face_stroke_width"],
+        "facesOnTop": scene["faces_on_top"],
+        "labels": scene["labels"],
+    }
+    # keep "</script>" in labels from closing the data block
+    text = json.dumps(payload).replace("</", "<\\/")
+
+    return _HTML_TEMPLATE.format(
+        background=_css_color(scene["background"]),
+        width=scene["width"],
+        height=scene["height"],
+        payload=text,
+    )
+
+
+def export_sight(
+    sight,
+    path: Union[str, Path],
+    format: Optional[str] = None,
+    width: int = 800,
+    height: int = 600,
+    padding: float = 20,
+) -> Path:
+    """
+    Write a static rendering of a Sight to disk without a browser
+
+    Args:
+        sight: Sight instance to render
+        path: Output file path
+        format: "png", "svg" or "html" (default: inferred from the suffix)
+        width: Output width in pixels
+        height: Output height in pixels
+        padding: Margin around the fitted graph in pixels
+
+    Notes:
+        Node positions are taken from the 'x', 'y' and 'z' fields; nodes
+        without them are placed with a seeded networkx spring layout. 3D
+        graphs are projected orthographically onto the x-y plane. Node
+        sizes and link widths are interpreted in output pixels.
+
+        The spring layout dominates the export time when positions are
+        missing: it is quadratic in the node count per iteration, and takes
+        several seconds at a few thousand nodes even with the iteration
+        count reduced past LAYOUT_NODES. Set 'x' and 'y' on the nodes (e.g.
+        from a layout computed once and reused) to skip it.
+    """
+    path = Path(path)
+    format = (format or path.suffix.lstrip(".")).lower()
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    if width <= 0 or height <= 0:
+        raise ValueError("width and height must be positive")
+
+    scene = _scene(sight, int(width), int(height), padding)
+
+    if format == "png":
+        path.write_bytes(encode_png(rasterize(scene)))
+    elif format == "svg":
+        path.write_text(render_svg(scene), encoding="utf-8")
+    else:
+        path.write_text(render_html(scene), encoding="utf-8")
+
+    return path
@@ -1,4 +1,5 @@
-from typing import Dict, List, Any, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union
 
 
 class Sight:
@@ -77,3 +78,29 @@ class Sight:
         from .server import run_server
 
         run_server(self, port)
+
+    def export(
+        self,
+        path: Union[str, Path],
+        format: Optional[str] = None,
+        width: int = 800,
+        height: int = 600,
+        padding: float = 20,
+    ) -> Path:
+        """
+        Render to a static file without starting the server or a browser
+
+        Args:
+            path: Output file path
+            format: "png", "svg" or "html" (default: inferred from the suffix)
+            width: Output width in pixels
+            height: Output height in pixels
+            padding: Margin around the graph in pixels
+
+        Notes:
+            Uses the nodes' 'x', 'y' and 'z' positions where present; see
+            zen_sight.export.export_sight for details
+        """
+        from .export import export_sight
+
+        return export_sight(self, path, format, width, height, padding)
@@ -0,0 +1,330 @@
+import base64
+import json
+import struct
+import warnings
+import zlib
+from unittest import mock
+from xml.etree import ElementTree
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from zen_sight import Sight
+from zen_sight import export
+from zen_sight.export import encode_png, parse_color, rasterize
+
+
+def decode_png(data):
+    """Return (width, height, pixels) from a PNG written by encode_png"""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    length, kind = struct.unpack(">I4s", data[8:16])
+    assert kind == b"IHDR"
+    width, height = struct.unpack(">II", data[16:24])
+
+    offset, idat = 8, b""
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset : offset + 8])
+        body = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        if kind == b"IDAT":
+            idat += body
+        offset += 12 + length
+
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8)
+    raw = raw.reshape(height, 1 + width * 3)
+    assert (raw[:, 0] == 0).all()
+    return width, height, raw[:, 1:].reshape(height, width, 3)
+
+
+def hexagon():
+    angles = np.linspace(0, 2 * np.pi, 7)[:-1]
+    nodes = [{"id": 0, "x": 0, "y": 0}] + [
+        {"id": i + 1, "x": 50 * np.cos(a), "y": 50 * np.sin(a)}
+        for i, a in enumerate(angles)
+    ]
+    links = [{"source": 0, "target": i} for i in range(1, 7)]
+    sight = Sight("2D", nodes, links)
+    sight.set_faces([(0, i, i % 6 + 1) for i in range(1, 7)])
+    return sight
+
+
+def segment_reference(a, b, width, shape):
+    """Coverage of a segment on every pixel of the canvas"""
+    py, px = np.mgrid[0 : shape[0], 0 : shape[1]] + 0.5
+    d = b - a
+    t = np.clip(((px - a[0]) * d[0] + (py - a[1]) * d[1]) / (d @ d), 0, 1)
+    dist = np.hypot(px - a[0] - t * d[0], py - a[1] - t * d[1])
+    return np.clip(max(width, 1) / 2 + 0.5 - dist, 0, 1) * min(width, 1)
+
+
+def test_png_round_trip(tmp_path):
+    sight = hexagon()
+    scene = export._scene(sight, 120, 80, 10)
+    image = rasterize(scene)
+
+    width, height, pixels = decode_png(encode_png(image))
+    assert (width, height) == (120, 80)
+    np.testing.assert_array_equal(pixels, image)
+
+    path = sight.export(tmp_path / "hexagon.png", width=120, height=80, padding=10)
+    np.testing.assert_array_equal(decode_png(path.read_bytes())[2], image)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("#ff0000", (255, 0, 0, 255)),
+        ("#f00", (255, 0, 0, 255)),
+        ("#ff000080", (255, 0, 0, 128)),
+        ("steelblue", (70, 130, 180, 255)),
+        ("RebeccaPurple", (102, 51, 153, 255)),
+        ("transparent", (0, 0, 0, 0)),
+        ("rgb(52, 152, 219)", (52, 152, 219, 255)),
+        ("rgba(52, 152, 219, 0.5)", (52, 152, 219, 127.5)),
+        ("rgb(10%, 0%, 100%)", (25.5, 0, 255, 255)),
+        ("rgb(255 0 0 / 50%)", (255, 0, 0, 127.5)),
+        ("hsl(0, 100%, 50%)", (255, 0, 0, 255)),
+        ("hsla(120deg, 100%, 25%, 0.5)", (0, 127.5, 0, 127.5)),
+        ("hsl(0.5turn 100% 50%)", (0, 255, 255, 255)),
+    ],
+)
+def test_parse_color(text, expected):
+    np.testing.assert_allclose(parse_color(text) * 255, expected)
+
+
+@pytest.mark.parametrize("value", ["nope", "rgb(1, 2)", "#12345", "hsl(x, 1%, 1%)", 5])
+def test_parse_color_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_color(value)
+
+
+def test_invalid_color_warns_and_uses_default():
+    sight = Sight("2D", [{"id": 0, "x": 0, "y": 0, "color": "bogus"}])
+    with pytest.warns(UserWarning, match="bogus"):
+        scene = export._scene(sight, 50, 50, 5)
+    np.testing.assert_allclose(scene["node_colors"][0], parse_color("#696969"))
+
+
+def test_node_auto_color_matches_frontend():
+    # the frontend always passes nodeColor as a function, so force-graph
+    # never applies nodeAutoColorBy
+    nodes = [{"id": i, "x": i, "y": 0, "group": i} for i in range(3)]
+    sight = Sight("2D", nodes, config={"nodeAutoColorBy": "group"})
+    scene = export._scene(sight, 50, 50, 5)
+    np.testing.assert_allclose(scene["node_colors"], [parse_color("#696969")] * 3)
+
+
+def test_3d_defaults_match_force_graph_3d():
+    nodes = [{"id": 0, "x": 0, "y": 0}, {"id": 1, "x": 10, "y": 0}]
+    scene = export._scene(Sight("3D", nodes, [{"source": 0, "target": 1}]), 40, 30, 5)
+    np.testing.assert_allclose(scene["background"], parse_color("#000011"))
+    np.testing.assert_allclose(
+        scene["link_colors"], [parse_color("#f0f0f0") * [1, 1, 1, 0.2]]
+    )
+    np.testing.assert_allclose(scene["node_colors"][:, 3], 0.75)
+
+
+@pytest.mark.parametrize("graph_type", ["2D", "3D"])
+def test_layout_keeps_fixed_positions(graph_type):
+    nodes = [{"id": i, "x": 1000 + 10 * i, "y": 500} for i in range(5)]
+    nodes += [{"id": i} for i in range(5, 9)]
+    links = [{"source": i, "target": i + 1} for i in range(8)]
+    positions = export._layout(Sight(graph_type, nodes, links))
+
+    np.testing.assert_array_equal(
+        positions[:5, :2], [[1000 + 10 * i, 500] for i in range(5)]
+    )
+    assert np.isfinite(positions).all()
+    # missing nodes are placed around the fixed ones, not at networkx's scale
+    assert (np.abs(positions[5:, :2] - [1020, 500]) < 200).all()
+
+
+def test_layout_treats_none_and_nan_as_missing():
+    nodes = [
+        {"id": 0, "x": 0, "y": 0},
+        {"id": 1, "x": 10, "y": 10, "z": None},
+        {"id": 2, "x": None, "y": 5},
+        {"id": 3, "x": float("nan"), "y": float("inf")},
+    ]
+    sight = Sight("2D", nodes, [{"source": 0, "target": 2}])
+    positions = export._layout(sight)
+    assert np.isfinite(positions).all()
+    np.testing.assert_allclose(positions[:2], [[0, 0, 0], [10, 10, 0]])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        image = rasterize(export._scene(sight, 80, 60, 10))
+    assert (image != 255).any()
+
+
+def test_layout_fallback_without_scipy():
+    nodes = [{"id": i, "x": 1000 + 10 * i, "y": 500} for i in range(5)]
+    nodes += [{"id": i} for i in range(5, 9)]
+    with mock.patch.object(nx, "spring_layout", side_effect=ImportError):
+        positions = export._layout(Sight("2D", nodes))
+
+    np.testing.assert_array_equal(
+        positions[:5, :2], [[1000 + 10 * i, 500] for i in range(5)]
+    )
+    # on a circle spanning the fixed nodes
+    np.testing.assert_allclose(np.hypot(*(positions[5:, :2] - [1020, 500]).T), 20)
+
+
+@pytest.mark.parametrize("count, iterations", [(10, 50), (1000, 25), (10000, 10)])
+def test_layout_iterations_shrink_on_large_graphs(count, iterations):
+    sight = Sight("2D", [{"id": i} for i in range(count)])
+    with mock.patch.object(nx, "spring_layout", side_effect=ImportError) as layout:
+        export._layout(sight)
+    assert layout.call_args.kwargs["iterations"] == iterations
+
+
+@pytest.mark.parametrize("fmt", ["png", "svg", "html"])
+@pytest.mark.parametrize("nodes", [[], [{"id": 0}], [{"id": 0, "x": 3, "y": 4}]])
+def test_export_empty_and_single_node(tmp_path, fmt, nodes):
+    sight = Sight("2D", nodes, config={"backgroundColor": "#102030"})
+    path = sight.export(tmp_path / f"graph.{fmt}", width=40, height=30)
+    assert path.stat().st_size > 0
+
+    if fmt == "png":
+        width, height, pixels = decode_png(path.read_bytes())
+        assert (width, height) == (40, 30)
+        assert (pixels[0, 0] == [16, 32, 48]).all()
+        if nodes:
+            assert (pixels[15, 20] == [105, 105, 105]).all()
+
+
+def test_2d_faces_are_drawn_over_nodes():
+    nodes = [
+        {"id": 0, "x": 0, "y": 0},
+        {"id": 1, "x": 100, "y": 0},
+        {"id": 2, "x": 50, "y": 90},
+        {"id": 3, "x": 50, "y": 30, "size": 20},
+    ]
+    sight = Sight("2D", nodes)
+    sight.set_faces([(0, 1, 2)])
+    scene = export._scene(sight, 120, 110, 10)
+    x, y = np.round(scene["xy"][3]).astype(int)
+    gray, fill = parse_color("#696969"), parse_color("rgba(100, 150, 250, 0.2)")
+    expected = (gray[:3] * (1 - fill[3]) + fill[:3] * fill[3]) * 255
+    np.testing.assert_allclose(rasterize(scene)[y, x], expected, atol=1)
+
+    svg = export.render_svg(scene)
+    assert svg.index('class="nodes"') < svg.index('class="faces"')
+
+
+def test_svg_structure(tmp_path):
+    path = hexagon().export(tmp_path / "hexagon.svg", width=120, height=80)
+    root = ElementTree.parse(path).getroot()
+    counts = [
+        len(root.findall(f".//{{http://www.w3.org/2000/svg}}{tag}"))
+        for tag in ("circle", "line", "polygon")
+    ]
+    assert counts == [7, 6, 6]
+
+
+def test_html_payload_round_trip(tmp_path):
+    sight = hexagon()
+    sight.nodes[3]["name"] = "</script><b>x</b>"
+    scene = export._scene(sight, 120, 80, 10)
+    path = sight.export(tmp_path / "hexagon.html", width=120, height=80, padding=10)
+    text = path.read_text()
+
+    start = text.index('<script id="sight-data" type="application/json">')
+    data = text[start:].split(">", 1)[1].split("</script>", 1)[0]
+    assert "</" not in data
+    payload = json.loads(data)
+
+    def decode(key, dtype):
+        return np.frombuffer(base64.b64decode(payload[key]), dtype=dtype)
+
+    np.testing.assert_allclose(
+        decode("xy", "<f4").reshape(-1, 2), scene["xy"], rtol=1e-6
+    )
+    np.testing.assert_array_equal(decode("links", "<u4").reshape(-1, 2), scene["links"])
+    np.testing.assert_array_equal(decode("faces", "<u4").reshape(-1, 3), scene["faces"])
+    assert payload["labels"][3] == "</script><b>x</b>"
+
+
+def test_export_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        hexagon().export(tmp_path / "graph.jpg")
+
+
+def test_large_nodes_stay_inside_image():
+    nodes = [{"id": 0, "x": 0, "y": 0, "size": 50}, {"id": 1, "x": 10, "y": 0}]
+    scene = export._scene(Sight("2D", nodes), 400, 200, 20)
+    assert (scene["xy"][:, 0] - scene["radii"] >= 20 - 1e-9).all()
+    assert (scene["xy"][:, 0] + scene["radii"] <= 380 + 1e-9).all()
+
+
+def test_thumbnail_keeps_nodes_apart():
+    sight = hexagon()
+    sight.set_config({"nodeSize": 50})
+    scene = export._scene(sight, 64, 48, 20)
+    xy = scene["xy"]
+    assert np.ptp(xy[:, 0]) >= 24 and np.ptp(xy[:, 1]) >= 20
+    assert (xy >= 0).all() and (xy <= [64, 48]).all()
+
+
+@pytest.mark.parametrize(
+    "a, b, width",
+    [
+        ((10, 10), (390, 390), 10),
+        ((10, 10), (390, 390), 20),
+        ((10, 10), (390, 300), 10),
+        ((200, 5), (210, 395), 7),
+        ((0, 200), (400, 200), 0.5),
+        ((390, 20), (15, 380), 3),
+    ],
+)
+def test_segment_coverage_matches_reference(a, b, width):
+    # white link on black, nodes hidden, positions already in pixels
+    nodes = [{"id": 0, "x": a[0], "y": a[1]}, {"id": 1, "x": b[0], "y": b[1]}]
+    sight = Sight(
+        "2D",
+        nodes,
+        [{"source": 0, "target": 1}],
+        config={
+            "backgroundColor": "#000000",
+            "linkColor": "#ffffff",
+            "linkWidth": width,
+            "nodeOpacity": 0,
+        },
+    )
+    scene = export._scene(sight, 400, 400, 0)
+    image = rasterize(scene)[..., 0] / 255.0
+
+    xy = scene["xy"]
+    reference = segment_reference(xy[0], xy[1], width, (400, 400))
+    np.testing.assert_allclose(image, reference, atol=1 / 255)
+
+
+def test_compositing_matches_sequential_blending():
+    rng = np.random.default_rng(0)
+    nodes = [
+        {
+            "id": i,
+            "x": float(rng.uniform(0, 60)),
+            "y": float(rng.uniform(0, 40)),
+            "size": float(rng.uniform(5, 40)),
+            "color": f"rgba({i * 40}, {255 - i * 40}, 128, {rng.uniform(0.3, 1):.2f})",
+        }
+        for i in range(6)
+    ]
+    scene = export._scene(Sight("2D", nodes), 80, 60, 5)
+
+    # blend each disk over the full canvas in draw order
+    py, px = np.mgrid[0:60, 0:80] + 0.5
+    reference = np.ones((60, 80, 3))
+    for i in scene["node_order"]:
+        x, y = scene["xy"][i]
+        coverage = np.clip(scene["radii"][i] + 0.5 - np.hypot(px - x, py - y), 0, 1)
+        alpha = (coverage * scene["node_colors"][i, 3])[..., None]
+        reference = reference * (1 - alpha) + alpha * scene["node_colors"][i, :3]
+
+    # a tiny budget forces many batches
+    with mock.patch.object(export, "FRAGMENT_BUDGET", 64):
+        image = rasterize(scene)
+    np.testing.assert_allclose(image, np.round(reference * 255), atol=1)